@@ -26,6 +26,8 @@ class TreeGenerator:
         assert policy_0.board_size == policy_1.board_size, "Policies must be for the same board size"
         self.num_cols = policy_0.num_cols
         self.num_rows = policy_0.num_rows
+        # (info_state_0, info_state_1) -> tree_info_string result
+        self._info_str_cache = {}
 
         self.name_0 = name_0
         self.name_1 = name_1
@@ -121,6 +123,9 @@ class TreeGenerator:
             size="8.3,11.7",
             margin=5,
         )
+        # Names of the nodes and (parent, child) edges already in the tree
+        self._node_set = set()
+        self._edge_set = set()
         # Add the root node's children
         self._add_children(self.game_state)
 
@@ -137,77 +142,90 @@ class TreeGenerator:
 
     def _add_children(self, game_state, parent=None):
         """
-        Generates the children of the parent node.
+        Generates the children of the parent node. The game tree is walked
+        with an explicit stack, so deep games do not hit the recursion limit.
         """
-        info_state_0 = game_state.information_state_string(0)
-        info_state_1 = game_state.information_state_string(1)
-        info_state = game_state.information_state_string()
-        cur_player = game_state.current_player()
-        cur_player_terminal = 0 if cur_player == 0 else 1
-
-        if parent is None:
-            # Add the root node
-            info_state_str = self.tree_info_string(info_state_0, info_state_1)
-            node_label = f"{info_state_str}"
-            node = pydot.Node(node_label, **self.attributes["root"])
-            self.tree.add_node(node)
-            parent = node
-
-        # Add an edge for each action
-        a_p = self.policies[cur_player].get_action_probabilities(
-            info_state).items()
-        for action, prob in a_p:
-            # Update the game state
-            new_game_state = game_state.child(action)
-
-            # If terminal add terminal node
-            if new_game_state.is_terminal():
-                # Add node
+        stack = [(game_state, parent)]
+        while stack:
+            game_state, parent = stack.pop()
+            info_state = game_state.information_state_string()
+            cur_player = game_state.current_player()
+            cur_player_terminal = 0 if cur_player == 0 else 1
+
+            if parent is None:
+                # Add the root node
                 info_state_str = self.tree_info_string(
-                    new_game_state.information_state_string(0),
-                    new_game_state.information_state_string(1),
-                )
-                terminal_node = pydot.Node(
-                    f"{info_state_str}",
-                    **self.attributes[f"{cur_player_terminal}-terminal"],
+                    game_state.information_state_string(0),
+                    game_state.information_state_string(1),
                 )
-                self.tree.add_node(terminal_node)
-
-                # Add the edge if it doesnt already exist
+                node_label = f"{info_state_str}"
+                node = pydot.Node(node_label, **self.attributes["root"])
+                self._add_node(node_label, node)
+                parent = node
+
+            # Add an edge for each action
+            a_p = self.policies[cur_player].get_action_probabilities(
+                info_state).items()
+            children = []
+            for action, prob in a_p:
+                # Update the game state
+                new_game_state = game_state.child(action)
                 edge_label = f"{util.convert_position_to_alphanumeric(action, self.num_cols)}: {prob:.4f}"
-                if not self.tree.get_edge(parent, terminal_node):
-                    edge = pydot.Edge(
-                        parent,
-                        terminal_node,
-                        label=edge_label,
-                        **self.attributes["edge"],
-                    )
-                    self.tree.add_edge(edge)
-            else:
+                # Query the child state once, each call crosses into C++
                 info_state_str = self.tree_info_string(
                     new_game_state.information_state_string(0),
                     new_game_state.information_state_string(1),
                 )
+                is_terminal = new_game_state.is_terminal()
+
+                # If terminal add terminal node
+                if is_terminal:
+                    # Add node
+                    terminal_node = pydot.Node(
+                        f"{info_state_str}",
+                        **self.attributes[f"{cur_player_terminal}-terminal"],
+                    )
+                    self._add_node(f"{info_state_str}", terminal_node)
+
+                    # Add the edge if it doesnt already exist
+                    self._add_edge(parent, terminal_node, edge_label)
+                else:
+                    # Add the child node
+                    node_label = f"{info_state_str}"
+                    node = pydot.Node(node_label, **self.attributes[cur_player])
+                    self._add_node(node_label, node)
+
+                    # Add the edge if it doesnt already exist
+                    self._add_edge(parent, node, edge_label)
+
+                    # Add the child's children
+                    children.append((new_game_state, node))
+            # reversed so the children are expanded in action order
+            stack.extend(reversed(children))
+
+    def _add_node(self, node_label, node):
+        """ Adds the node to the tree unless a node with the same label exists. """
+        if node_label not in self._node_set:
+            self._node_set.add(node_label)
+            self.tree.add_node(node)
 
-                # Add the child node
-                node_label = f"{info_state_str}"
-                node = pydot.Node(node_label, **self.attributes[cur_player])
-                self.tree.add_node(node)
-
-                # Add the edge if it doesnt already exist
-                edge_label = f"{util.convert_position_to_alphanumeric(action, self.num_cols)}: {prob:.4f}"
-                if not self.tree.get_edge(parent, node):
-                    edge = pydot.Edge(parent,
-                                      node,
-                                      label=edge_label,
-                                      **self.attributes["edge"])
-                    self.tree.add_edge(edge)
-
-                # Add the child's children
-                self._add_children(new_game_state, node)
+    def _add_edge(self, parent, node, edge_label):
+        """ Adds an edge between the nodes unless the same edge exists. """
+        edge_key = (parent.get_name(), node.get_name())
+        if edge_key not in self._edge_set:
+            self._edge_set.add(edge_key)
+            edge = pydot.Edge(parent,
+                              node,
+                              label=edge_label,
+                              **self.attributes["edge"])
+            self.tree.add_edge(edge)
 
     def tree_info_string(self, info_state_0, info_state_1):
         """ Converts the info_state to a string. """
+        key = (info_state_0, info_state_1)
+        cached = self._info_str_cache.get(key)
+        if cached is not None:
+            return cached
         info_str = ""
         line_num = 1
         line_str_0 = ""
@@ -228,4 +246,5 @@ class TreeGenerator:
                 line_str_1 += f"{is_1_cell}"
         # add the last line
         info_str += f"\n{'':>{line_num-1}}{line_str_0}  {line_str_1}"
+        self._info_str_cache[key] = info_str
         return info_str
@@ -68,10 +68,10 @@ class MCCFRBase:
         Returns:
             np.array: The regrets after regret matching.
         """
-        regrets[regrets < 0] = 0.
+        np.maximum(regrets, 0., out=regrets)
         regret_sum = regrets.sum()
         if regret_sum > 0:
             regrets /= regret_sum
         else:
-            regrets[:] = 1. / num_legal_actions
+            regrets.fill(1. / num_legal_actions)
         return regrets
@@ -92,28 +92,37 @@ class SimPly:  # Simplified Policy
         policy. This is done by setting all the possible states for the
         continuation of the current state and then finding the action probabilities
         for each state based on the parameters and the existing policy.
-        This is a recursive function, filling the info_set with all the
-        possible states and action probabilities.
+        The states are walked depth-first with an explicit stack, filling the
+        info_set with all the possible states and action probabilities.
 
         Args:
             info_state (str): The info_state to iterate.
         """
-        new_info_states = self._get_new_info_states(info_state)
-        if not new_info_states:
-            return
-        actions = self.new_policy[info_state].keys()
-        collusion_possible = util.is_collusion_possible(info_state, self.player)
-        for action in actions:
-            new_info_state = new_info_states[f"{action}{self.player}"]
-            if not util.is_board_terminal(new_info_state, self.player) and \
-               new_info_state not in self.new_policy:
-                self._iterate_info_state(new_info_state)
-            if collusion_possible:
-                new_info_state = new_info_states[
-                    f"{action}{self.policy.opponent}"]
+        stack = [info_state]
+        while stack:
+            info_state = stack.pop()
+            if info_state in self.new_policy:
+                continue
+            new_info_states = self._get_new_info_states(info_state)
+            if not new_info_states:
+                continue
+            actions = self.new_policy[info_state].keys()
+            collusion_possible = util.is_collusion_possible(
+                info_state, self.player)
+            children = []
+            for action in actions:
+                new_info_state = new_info_states[f"{action}{self.player}"]
                 if not util.is_board_terminal(new_info_state, self.player) and \
                    new_info_state not in self.new_policy:
-                    self._iterate_info_state(new_info_state)
+                    children.append(new_info_state)
+                if collusion_possible:
+                    new_info_state = new_info_states[
+                        f"{action}{self.policy.opponent}"]
+                    if not util.is_board_terminal(new_info_state, self.player) and \
+                       new_info_state not in self.new_policy:
+                        children.append(new_info_state)
+            # reversed so the children are visited in action order
+            stack.extend(reversed(children))
 
     def _get_new_info_states(self, info_state: str) -> typing.Dict[str, str]:
         """
@@ -1,7 +1,15 @@
 """ Validity checks for the library. """
+import os
 import typing
 import darkhex
 
+# Whether the library runs its checks. The checks are on by default, they can
+# be turned off on hot paths with DARKHEX_CHECKS=0, and python -O turns them
+# off as it does asserts. Call sites check the flag before calling, i.e.
+#   if CHECK.ENABLED:
+#       CHECK.PLAYER(player)
+ENABLED = __debug__ and os.environ.get("DARKHEX_CHECKS", "1") != "0"
+
 
 def EQUAL(a: typing.Any, b: typing.Any):
     """
@@ -104,7 +112,7 @@ def PLAYER(player: int) -> None:
     """
     if not isinstance(player, int):
         raise ValueError(f"{player} is not an int")
-    if player not in [0, 1]:
+    if player not in (0, 1):
         raise ValueError(f"{player} is not 0 or 1")
 
 
@@ -215,19 +223,33 @@ def COLUMN_INDEX(column_to_check: int, num_columns: int) -> None:
         )
 
 
-# def BOARD(board: str) -> None:
-#     """
-#     Check if the board is valid.
-#         - Type should be str
-#         - The board should be a valid board
-
-#     Args:
-#         board (str): The board to check.
-#     """
-#     if not isinstance(board, str):
-#         raise ValueError(f"{board} is not a string")
-#     for cell in board:
-#         if cell not in darkhex.cellState.white_pieces + darkhex.cellState.black_pieces + [
-#                 darkhex.cellState.kEmpty
-#         ]:
-#             raise ValueError(f"{cell} is not a valid cell state")
+# Removes every valid cell state (and the row separator of layered boards),
+# so a valid board translates to an empty string in a single pass.
+_BOARD_CELLS = str.maketrans(
+    "", "", "".join(darkhex.cellState.white_pieces +
+                    darkhex.cellState.black_pieces +
+                    [darkhex.cellState.kEmpty, "\n"]))
+
+
+def BOARD(board: str, num_rows: int, num_cols: int) -> None:
+    """
+    Check if the board is valid.
+        - Type should be str
+        - The board should only contain valid cell states, rows may be
+        separated by new lines
+        - The board should have num_rows * num_cols cells
+
+    Args:
+        board (str): The board to check.
+        num_rows (int): The number of rows of the board.
+        num_cols (int): The number of columns of the board.
+    """
+    if not isinstance(board, str):
+        raise ValueError(f"{board} is not a string")
+    invalid_cells = board.translate(_BOARD_CELLS)
+    if invalid_cells:
+        raise ValueError(f"{invalid_cells[0]} is not a valid cell state")
+    num_cells = len(board) - board.count("\n")
+    if num_cells != num_rows * num_cols:
+        raise ValueError(
+            f"{num_cells} cells is not a valid board for {num_rows}x{num_cols}")
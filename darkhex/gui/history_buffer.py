@@ -1,12 +1,22 @@
-import copy
+import collections
 from darkhex import logger as log
 
 
 class gameBuffer:
-    """History buffer for the game to use for rewind and restart."""
+    """History buffer for the game to use for rewind and restart. Only the
+    latest max_size moves can be rewound, the initial state is always kept
+    for restarts."""
 
-    def __init__(self, initial_board: str, num_rows: int, num_cols: int,
-                 player: int, include_isomorphic: bool, stratgen_class) -> None:
+    __slots__ = ("game_info", "history", "stratgen_class", "initial_snapshot")
+
+    def __init__(self,
+                 initial_board: str,
+                 num_rows: int,
+                 num_cols: int,
+                 player: int,
+                 include_isomorphic: bool,
+                 stratgen_class,
+                 max_size: int = 64) -> None:
         self.game_info = {
             "num_rows": num_rows,
             "num_cols": num_cols,
@@ -14,25 +24,25 @@ class gameBuffer:
             "isomorphic": include_isomorphic,
             "initial_board": initial_board,
         }
-        self.info_states = []
-        self.current_info_state = []
-        self.target_stack_state = []
+        # (info_states, current_info_state, target_stack_state) snapshots
+        self.history = collections.deque(maxlen=max_size)
         self.stratgen_class = stratgen_class
         self.add_history_buffer(stratgen_class)
+        self.initial_snapshot = self.history[0]
 
     def add_history_buffer(self, stratgen_class):
-        self.info_states.append(copy.deepcopy(stratgen_class.info_states))
-        self.current_info_state.append(
-            copy.deepcopy(stratgen_class.current_info_state))
-        self.target_stack_state.append(
-            copy.deepcopy(stratgen_class.target_stack_state))
+        # info_states values are only ever rebound, never mutated in place,
+        # so a shallow copy is enough; info states are immutable strings.
+        self.history.append((
+            stratgen_class.info_states.copy(),
+            stratgen_class.current_info_state,
+            stratgen_class.target_stack_state,
+        ))
 
     def rewind(self) -> None:
         """Rewinds the game."""
-        if len(self.info_states) > 1:
-            self.info_states.pop()
-            self.current_info_state.pop()
-            self.target_stack_state.pop()
+        if len(self.history) > 1:
+            self.history.pop()
         else:
             log.info("Cannot rewind any further.")
             return
@@ -41,9 +51,8 @@ class gameBuffer:
 
     def restart(self) -> None:
         """Restarts the game."""
-        self.info_states = self.info_states[:1]
-        self.current_info_state = self.current_info_state[:1]
-        self.target_stack_state = self.target_stack_state[:1]
+        self.history.clear()
+        self.history.append(self.initial_snapshot)
         self._update_game(0)
         log.info("Restarted the game.")
 
@@ -55,17 +64,15 @@ class gameBuffer:
     #     return -1
 
     def _revert(self, idx):
-        self.info_states = self.info_states[:idx + 1]
-        self.current_info_state = self.current_info_state[:idx + 1]
-        self.target_stack_state = self.target_stack_state[:idx + 1]
+        while len(self.history) > idx + 1:
+            self.history.pop()
         self._update_game(idx)
 
     def _update_game(self, idx):
-        self.stratgen_class.info_states = copy.deepcopy(self.info_states[idx])
-        self.stratgen_class.current_info_state = copy.deepcopy(
-            self.current_info_state[idx])
-        self.stratgen_class.target_stack_state = copy.deepcopy(
-            self.target_stack_state[idx])
+        info_states, current_info_state, target_stack_state = self.history[idx]
+        self.stratgen_class.info_states = info_states.copy()
+        self.stratgen_class.current_info_state = current_info_state
+        self.stratgen_class.target_stack_state = target_stack_state
 
     # def revert_to_state(self, idx=None, state=None):
     #     if idx and state:
@@ -110,6 +110,8 @@ class PolicyGenGUI(ctk.CTk):
         self.frame_board.update_idletasks()
         board = util.get_board_from_info_state(
             self.strat_gen.current_info_state, self.perfect_recall)
+        # the frame might have been resized, recreate the cells from scratch
+        self._last_board = None
         self.draw_board(board)
 
     def setup_game(self,
@@ -224,6 +226,8 @@ class PolicyGenGUI(ctk.CTk):
             command=self.text_info_state_history.yview)
         self.text_info_state_history.configure(
             yscrollcommand=self.scrollbar_info_state_history.set)
+        # scrolling to the end is done at most once per idle cycle
+        self._history_scroll_pending = False
 
         # placing the items on subframes
         self.label_info_state_history.grid(row=0,
@@ -278,10 +282,6 @@ class PolicyGenGUI(ctk.CTk):
         """ Sets up the board frame """
         self.frame_board = self._init_board_frame()
 
-        self.frame_board.update()
-        canvas_width = self.frame_board.winfo_width()
-        canvas_height = self.frame_board.winfo_height()
-
         # Frame board is 1x1 grid
         self.frame_board.rowconfigure(0, weight=1)
         self.frame_board.columnconfigure(0, weight=1)
@@ -594,54 +594,88 @@ class PolicyGenGUI(ctk.CTk):
         self.last_state.append(self.strat_gen.current_info_state)
 
     def update_history_text(self):
-        self.text_info_state_history.configure(state=tk.NORMAL)
-        self.text_info_state_history.delete("1.0", tk.END)
-        self.text_info_state_history.see(index=tk.END)
+        lines = []
         for info_state, action_probs in self.strat_gen.info_states.items():
             info_text = info_state.replace("\n", r"\n")
-            a_p_text = ", ".join(f"[{action}: {prob}]" for action, prob in action_probs)
-            self.text_info_state_history.insert(tk.END, f"{info_text}: {a_p_text}\n")
-        self.text_info_state_history.update()
-        self.text_info_state_history.after(100, self.text_info_state_history.see(tk.END))
+            a_p_text = ", ".join(f"[{action}: {prob}]" for action, prob in action_probs.items())
+            lines.append(f"{info_text}: {a_p_text}\n")
+        self.text_info_state_history.configure(state=tk.NORMAL)
+        self.text_info_state_history.delete("1.0", tk.END)
+        self.text_info_state_history.insert(tk.END, "".join(lines))
         self.text_info_state_history.configure(state=tk.DISABLED)
+        if not self._history_scroll_pending:
+            self._history_scroll_pending = True
+            self.after_idle(self._flush_history_scroll)
 
+    def _flush_history_scroll(self):
+        """ Scrolls the history text to the end, see update_history_text. """
+        self.text_info_state_history.see(tk.END)
+        self._history_scroll_pending = False
 
     def draw_board(self, board_str: str) -> None:
+        """Draws the board. Canvas items are created once, afterwards only
+        the cells that changed since the last draw are updated."""
+        board_str = util.layered_board_to_flat(board_str)
+        if self._last_board is None:
+            self._create_board_items()
+            changed_cells = range(self.num_rows * self.num_cols)
+        else:
+            changed_cells = [
+                cell_id for cell_id, (new_cell, old_cell) in enumerate(
+                    zip(board_str, self._last_board)) if new_cell != old_cell
+            ]
+        # All changed cells are updated with a single Tcl script, so a move
+        # costs one round-trip to the interpreter.
+        script = "\n".join(
+            self._cell_script(board_str[cell_id], cell_id)
+            for cell_id in changed_cells)
+        if script:
+            self.canvas.tk.eval(script)
+        self._last_board = board_str
+
+    def _create_board_items(self) -> None:
+        """Creates the canvas items for every cell. Stones are created hidden,
+        draw_board shows them through the Tcl commands from _cell_script."""
         self.canvas.delete("all")
         self.calculate_board_locations()
+        self.canvas_path = str(self.canvas)
+        self.oval_ids = []
         for cell_id in range(self.num_rows * self.num_cols):
-            self._draw_cell(board_str[cell_id], cell_id)
-
-    def _draw_cell(self, cell_str: str, cell_id: int) -> None:
-        """Draws a cell on the canvas."""
-        # Draw the cell.
-        self.canvas.create_polygon(
-            self.coord_cells[cell_id],
-            fill=self.COLORS["."],
-            outline=self.frame_board.cget("bg"),
-            width=4,
-        )
-        # Draw the cell's content.
-        if cell_str in cellState.black_pieces:
-            self.canvas.create_oval(
-                self.loc_circle[cell_id],
-                fill=self.COLORS["x"],
-                outline=self.COLORS["black"],
-                width=4,
-            )
-        elif cell_str in cellState.white_pieces:
-            self.canvas.create_oval(
-                self.loc_circle[cell_id],
-                fill=self.COLORS["o"],
-                outline=self.COLORS["black"],
+            # Draw the cell.
+            self.canvas.create_polygon(
+                *self.coord_cells[cell_id],
+                fill=self.COLORS["."],
+                outline=self.frame_board.cget("bg"),
                 width=4,
             )
-        # Draw the cell id.
-        # convert cell_id to alphanumeric id
-        text_id = util.convert_position_to_alphanumeric(cell_id, self.num_cols)
-        self.canvas.create_text(self.loc_cen[cell_id],
-                                text=str(text_id),
-                                fill=self.COLORS["white"])
+            # The cell's content.
+            self.oval_ids.append(
+                self.canvas.create_oval(
+                    self.loc_circle[cell_id],
+                    fill=self.COLORS["x"],
+                    outline=self.COLORS["black"],
+                    width=4,
+                    state=tk.HIDDEN,
+                ))
+            # Draw the cell id.
+            # convert cell_id to alphanumeric id
+            text_id = util.convert_position_to_alphanumeric(
+                cell_id, self.num_cols)
+            self.canvas.create_text(self.loc_cen[cell_id],
+                                    text=str(text_id),
+                                    fill=self.COLORS["white"])
+        # lay out every new item at once
+        self.canvas.update_idletasks()
+
+    def _cell_script(self, cell_str: str, cell_id: int) -> str:
+        """Returns the Tcl command that updates the cell's content on the
+        canvas."""
+        command = f"{self.canvas_path} itemconfigure {self.oval_ids[cell_id]}"
+        if cell_str in cellState.black_pieces:
+            return f"{command} -fill {self.COLORS['x']} -state {tk.NORMAL}"
+        if cell_str in cellState.white_pieces:
+            return f"{command} -fill {self.COLORS['o']} -state {tk.NORMAL}"
+        return f"{command} -state {tk.HIDDEN}"
 
     def _init_board_frame(self) -> tk.Frame:
         frm = ctk.CTkFrame(
@@ -657,6 +691,8 @@ class PolicyGenGUI(ctk.CTk):
                                 background=frm.cget('bg'),
                                 highlightthickness=0)
         self.canvas.grid(row=0, column=0, sticky="nsew")
+        # board drawn on the canvas, None until the cells are created
+        self._last_board = None
 
         frm.grid_rowconfigure(0, weight=1)
         frm.grid_columnconfigure(0, weight=1)
@@ -668,7 +704,7 @@ class PolicyGenGUI(ctk.CTk):
         # Calculate cell locations
         self.loc_cen = [(0, 0) for _ in range(self.num_rows * self.num_cols)]
         self.coord_cells = [
-            (0 for __ in range(6)) for _ in range(self.num_rows * self.num_cols)
+            (0,) * 12 for _ in range(self.num_rows * self.num_cols)
         ]
         self.loc_circle = [
             (0, 0, 0, 0) for _ in range(self.num_rows * self.num_cols)
@@ -681,15 +717,15 @@ class PolicyGenGUI(ctk.CTk):
                 # Draw the cell.
                 x = len_sq + row * len_sq + 2 * col * len_sq + self.CELL_PADDING
                 y = 1.5 * row * self.cell_edge_length + self.CELL_PADDING
+                # Flat (x0, y0, ..., x5, y5) so create_polygon gets the
+                # coordinates without unpacking nested pairs.
                 loc = (
-                    (x, y),  # top-middle
-                    (x + len_sq, y + self.cell_edge_length * 0.5),  # top-right
-                    (x + len_sq,
-                     y + self.cell_edge_length * 1.5),  # bottom-right
-                    (x, y + 2 * self.cell_edge_length),  # bottom-middle
-                    (x - len_sq,
-                     y + self.cell_edge_length * 1.5),  # bottom-left
-                    (x - len_sq, y + self.cell_edge_length * 0.5),  # top-left
+                    x, y,  # top-middle
+                    x + len_sq, y + self.cell_edge_length * 0.5,  # top-right
+                    x + len_sq, y + self.cell_edge_length * 1.5,  # bottom-right
+                    x, y + 2 * self.cell_edge_length,  # bottom-middle
+                    x - len_sq, y + self.cell_edge_length * 1.5,  # bottom-left
+                    x - len_sq, y + self.cell_edge_length * 0.5,  # top-left
                 )
                 # Save the center of the cell.
                 self.loc_circle[cell_id] = (
@@ -704,19 +740,19 @@ class PolicyGenGUI(ctk.CTk):
                 cell_id += 1
 
     def get_board_width(self) -> int:
-        """Returns the width of the board_frame."""
-        self.frame_board.update()
+        """Returns the width of the board_frame, as of the last layout pass."""
         board_width = self.frame_board.winfo_width()
         return board_width
 
     def get_board_height(self) -> int:
-        """Returns the height of the board_frame."""
-        self.frame_board.update()
+        """Returns the height of the board_frame, as of the last layout pass."""
         board_height = self.frame_board.winfo_height()
         return board_height
 
     def update_lengths(self) -> None:
         """Updates the lengths of the cells."""
+        # a single layout pass, update() would also run pending events
+        self.frame_board.update_idletasks()
         w = self.get_board_width() - self.CELL_PADDING * 2 - 8
         h = self.get_board_height() - self.CELL_PADDING * 2 - 8
         board_w = self.board_width_coefficient(self.num_rows, self.num_cols)
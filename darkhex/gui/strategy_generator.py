@@ -1,12 +1,11 @@
 """Strategy generator app with Tkinter GUI."""
 import typing
 from collections import Counter
-from copy import deepcopy
 
 from darkhex import cellState
+import darkhex.check as CHECK
 import darkhex.utils.util as util
 from darkhex import logger as log
-from darkhex.utils.isomorphic import isomorphic_single
 from darkhex.policy import SinglePlayerTabularPolicy
 from darkhex.gui.history_buffer import gameBuffer
 
@@ -19,6 +18,24 @@ def error_log(message):
 
 class StrategyGenerator:
 
+    __slots__ = (
+        "num_cols",
+        "num_rows",
+        "p",
+        "o",
+        "include_isomorphic",
+        "initial_state",
+        "current_info_state",
+        "info_states",
+        "action_stack",
+        "perfect_recall",
+        "action_stack_action_history",
+        "random_act",
+        "target_stack_state",
+        "iterate_board",
+        "history_buffer",
+    )
+
     def __init__(
         self,
         initial_state: str,
@@ -28,6 +45,11 @@ class StrategyGenerator:
         include_isomorphic: bool = True,
         is_perfect_recall: bool = False,
     ):
+        if CHECK.ENABLED:
+            CHECK.BOARD(
+                util.get_board_from_info_state(initial_state,
+                                               is_perfect_recall), num_rows,
+                num_cols)
         self.num_cols = num_cols
         self.num_rows = num_rows
         self.p = player
@@ -44,11 +66,16 @@ class StrategyGenerator:
         self.random_act = False  # if true, take actions until the terminal state.
         self.target_stack_state = None
 
+        # include_isomorphic is fixed for a game, so the move handler is
+        # picked once here instead of branching on it for every move.
+        self.iterate_board = (self._iterate_board_iso if include_isomorphic
+                              else self._iterate_board_plain)
+
         # set history buffer
         self.history_buffer = gameBuffer(self.initial_state, num_rows, num_cols,
                                          player, include_isomorphic, self)
 
-    def iterate_board(self, given_input: str) -> bool:
+    def _iterate_board_plain(self, given_input: str) -> bool:
         """Iterate the board with the given action_probability. Actions might be in the form of 
         alpha-numeric or integer representation of the cell. This function updates 
         the information state and the current strategy based on the action.
@@ -67,31 +94,30 @@ class StrategyGenerator:
         # update the strategy
         self.info_states[self.current_info_state] = self._action_probs(
             actions, probs)
+        return self._next_info_state(addition)
 
-        if self.include_isomorphic:
-            raise NotImplementedError("isomorphic not implemented")
-            iso_state, iso_actions_probs = isomorphic_single(
-                self.current_info_state, actions, probs
-            )  # ! WRONG: Just using the board, should convert to info state
-            if iso_state not in self.info_states:
-                self.info_states[iso_state] = iso_actions_probs
-            else:
-                ls = []
-                d = {}
-                for action, prob in iso_actions_probs:
-                    if action not in d:
-                        ls.append((action, prob / 2))
-                        d[action] = len(ls) - 1
-                    else:
-                        ls[d[action]] = (action, ls[d[action]][1] + prob / 2)
-                for action, prob in self.info_states[iso_state]:
-                    if action not in d:
-                        ls.append((action, prob / 2))
-                        d[action] = len(ls) - 1
-                    else:
-                        ls[d[action]] = (action, ls[d[action]][1] + prob / 2)
-                self.info_states[iso_state] = ls
+    def _iterate_board_iso(self, given_input: str) -> bool:
+        """Same as _iterate_board_plain, but the strategy would also be merged
+        into the isomorphic info state. Not implemented yet; raises before
+        the game is changed.
+
+        Args:
+            given_input (str): The action probabilities. i.e. "a4 0.5 b4 0.5" or "= a4 b4"
+
+        Returns:
+            bool: True if the game is over.
+        """
+        raise NotImplementedError("isomorphic not implemented")
+
+    def _next_info_state(self, addition: int) -> bool:
+        """Moves on to the next info state waiting in the action stack.
+
+        Args:
+            addition (int): The number of info states the last move queued.
 
+        Returns:
+            bool: True if the game is over.
+        """
         if len(self.action_stack) == 0:
             self.history_buffer.add_history_buffer(self)
             log.info(f"Game has ended. No more actions to take.")
@@ -102,7 +128,7 @@ class StrategyGenerator:
         if self.random_act:
             self.random_act = False
             try:
-                self.target_stack_state = deepcopy(self.action_stack[-addition])
+                self.target_stack_state = self.action_stack[-addition]
             except IndexError:
                 self.target_stack_state = None
         if self.target_stack_state:
@@ -144,7 +170,7 @@ class StrategyGenerator:
             if isinstance(a, int):
                 if util.is_valid_action_from_info_state(self.current_info_state,
                                                         a):
-                    actions, probs = [a], [1]
+                    actions, probs = [a], [1.0]
         elif action_probs[0] == "=":  # equiprobable actions
             actions = [
                 util.convert_alphanumeric_to_position(x, self.num_cols)
@@ -155,15 +181,21 @@ class StrategyGenerator:
             for i in range(0, len(action_probs), 2):
                 a = util.convert_alphanumeric_to_position(
                     action_probs[i], self.num_cols)
-                if a:
+                # a1 is the action 0, so only a missing action is invalid
+                if a is not None:
                     actions.append(a)
                     probs.append(float(action_probs[i + 1]))
                 else:
                     error_log(f"Invalid action: {action_probs[i]}")
         if not actions or not probs:
             error_log(f"No valid actions found. {given_input}")
-        actions = list(map(int, actions))
-        probs = list(map(float, probs))
+        # the strategy maps actions to probs, a repeated action would be lost
+        if len(set(actions)) != len(actions):
+            error_log(f"Repeated actions: {given_input}")
+        # check if sum of probs is 1, before any new state is queued
+        total_prob = sum(probs)
+        if abs(total_prob - 1) > 0.0000001:  # python float comparison
+            error_log(f"Values don't add up to one: {probs}->{total_prob}")
         addition = 0
         p_list = [self.p, self.o] if util.is_collusion_possible_info_state(
             self.current_info_state) else [self.p]
@@ -176,16 +208,13 @@ class StrategyGenerator:
                 elif new_state not in self.info_states:
                     self.action_stack.append(new_state)
                     addition += 1
-        # check if sum of probs is 1
-        if abs(sum(probs) - 1) > 0.0000001:  # python float comparison
-            error_log(f"Values don't add up to one: {probs}->{sum(probs)}")
         log.info(f"Input processed successfully. {actions} {probs}")
         return actions, probs, addition
 
     def _action_probs(self,
                       actions: typing.List[int],
                       probs: typing.List[float] = None
-                     ) -> typing.List[typing.Tuple[int, float]]:
+                     ) -> typing.Dict[int, float]:
         """Returns the action probs for the current board. If no probs are given, the probs are uniform.
 
         Args:
@@ -193,13 +222,13 @@ class StrategyGenerator:
             probs (typing.List[float]): The corresponding probabilities.
 
         Returns:
-            typing.List[typing.Tuple[int, float]]: The action probs.
+            typing.Dict[int, float]: The action probs.
         """
         if probs is None:
             probs = [1 / len(actions)] * len(actions)
         else:
             assert len(actions) == len(probs)
-        return list(zip(actions, probs))
+        return dict(zip(actions, probs))
 
     def save_darkhex_policy(self, path) -> SinglePlayerTabularPolicy:
         """Converts the stored policy to a darkhex policy.
@@ -224,6 +253,8 @@ class StrategyGenerator:
         self.o = 1 - self.p
         self.history_buffer = history
         self.history_buffer.stratgen_class = self
-        self.info_states = history.info_states[-1]
-        self.target_stack_state = history.target_stack_state[-1]
-        self.current_info_state = history.current_info_state[-1]
+        latest = history.history[-1]
+        info_states, current_info_state, target_stack_state = latest
+        self.info_states = info_states.copy()
+        self.target_stack_state = target_stack_state
+        self.current_info_state = current_info_state
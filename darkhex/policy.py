@@ -1,4 +1,8 @@
+import sys
+import types
 import typing
+import functools
+import numpy as np
 import darkhex.utils.util as util
 import pyspiel
 import os
@@ -6,8 +10,74 @@ import darkhex.check as CHECK
 from darkhex import logger as log
 
 
+@functools.lru_cache(maxsize=32)
+def _load_policy_data(path: str, mtime: float) -> util.dotdict:
+    """
+    Load the tabular policy data from the file. The data is cached by the
+    file's path and modification time, so a policy file is only unpickled once
+    while it does not change. The data is shared between the policies loading
+    it, so only tabular policies use the cache: their arrays are never changed
+    in place and a pyspiel initial state is cloned. Solver files are not
+    cached, a solver is trained further in place.
+
+    Args:
+        path (str): The absolute path of the policy file.
+        mtime (float): The modification time of the policy file.
+    Returns:
+        util.dotdict: The policy data.
+    """
+    return util.load_file(path)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_game(game_string: str) -> pyspiel.Game:
+    """
+    Load the pyspiel game, the games are shared between the policies.
+
+    Args:
+        game_string (str): The game string, i.e. "dark_hex_ir(num_cols=3,num_rows=4)".
+    Returns:
+        pyspiel.Game: The game.
+    """
+    return pyspiel.load_game(game_string)
+
+
+def _load_policy_file(path: str) -> util.dotdict:
+    """
+    Load the policy data from the file, see _load_policy_data.
+
+    Args:
+        path (str): The path of the policy file.
+    Returns:
+        util.dotdict: The policy data.
+    """
+    return _load_policy_data(os.path.abspath(path), os.path.getmtime(path))
+
+
+def _best_action(action_probs: typing.Dict[int, float]) -> int:
+    """
+    Get the most likely action, the first one on ties. Same as
+    max(action_probs, key=action_probs.get), without a key call per action.
+
+    Args:
+        action_probs (typing.Dict[int, float]): The action probabilities.
+    Returns:
+        int: The action, -1 if there are no actions.
+    """
+    best_action, best_prob = -1, -1.
+    for action, prob in action_probs.items():
+        if prob > best_prob:
+            best_action, best_prob = action, prob
+    return best_action
+
+
 class Policy:
 
+    # The policy is stored by the subclasses, either in a "policy" slot or
+    # behind a policy property.
+    __slots__ = ("initial_state", "board_size", "is_perfect_recall",
+                 "is_best_response", "player")
+
     def __init__(self,
                  policy,
                  board_size: typing.Tuple[int, int],
@@ -24,10 +94,13 @@ class Policy:
             is_perfect_recall (bool): Whether the policy is perfect recall.
             is_best_response (bool): Whether the policy is best response.
         """
+        # set by single player policies, or by the loaded policy data
+        self.player = None
         if isinstance(policy, str):
             # setup all the parameters using the policy data
             self._load_policy(policy, is_best_response)
-            CHECK.EQUAL_OR_N(self.board_size, board_size)
+            if CHECK.ENABLED:
+                CHECK.EQUAL_OR_N(self.board_size, board_size)
             # Todo: CHECK.EQUAL_OR_N(self.initial_state, initial_state)
         else:
             assert initial_state is not None, "Initial state must be provided"
@@ -39,9 +112,21 @@ class Policy:
             self.policy = policy
             self.is_perfect_recall = is_perfect_recall
             self.is_best_response = is_best_response
-        self.num_rows = self.board_size[0]
-        self.num_cols = self.board_size[1]
-        self.num_cells = self.num_rows * self.num_cols
+
+    @property
+    def num_rows(self) -> int:
+        """ The number of rows of the board. """
+        return self.board_size[0]
+
+    @property
+    def num_cols(self) -> int:
+        """ The number of columns of the board. """
+        return self.board_size[1]
+
+    @property
+    def num_cells(self) -> int:
+        """ The number of cells of the board. """
+        return self.board_size[0] * self.board_size[1]
 
     def get_action_probabilities(self,
                                  info_state: str) -> typing.Dict[int, float]:
@@ -64,8 +149,19 @@ class Policy:
         Returns:
             The action.
         """
-        a_p = self.get_action_probabilities(info_state)
-        return max(a_p, key=a_p.get)
+        return _best_action(self.get_action_probabilities(info_state))
+
+    def get_actions(self, info_states: typing.Iterable[str]) -> np.ndarray:
+        """
+        Take an action for each of the given states.
+        Args:
+            info_states: The info states.
+
+        Returns:
+            The actions, in the order of the info states.
+        """
+        return np.array([self.get_action(info_state) for info_state in info_states],
+                        dtype=np.int64)
 
     def _load_policy(self, policy_name: str, is_best_response: bool) -> None:
         """
@@ -73,21 +169,30 @@ class Policy:
         Args:
             policy_name (str): The policy_name name/folder path.
         """
-        if policy_name not in os.listdir(util.PathVars.policies):
+        policy_dir = os.path.join(util.PathVars.policies, policy_name)
+        if not os.path.isdir(policy_dir):
             path = policy_name
         else:
             if is_best_response:
-                path = util.PathVars.policies + policy_name + "/best_response.pkl"
+                path = os.path.join(policy_dir, "best_response.pkl")
             else:
-                path = util.PathVars.policies + policy_name + "/policy.pkl"
-        data = util.load_file(path)
+                path = os.path.join(policy_dir, "policy.pkl")
+        data = _load_policy_file(path)
         log.debug(f"Loaded data from path: {path} | {data}")
-        self.policy = data.policy
-        self.initial_state = data.initial_state
+        if data.policy_arrays is not None:
+            self._set_policy_arrays(*data.policy_arrays)
+        else:
+            # saved before policies were stored as arrays
+            self.policy = data.policy
+        if isinstance(data.initial_state, pyspiel.State):
+            # the cached data is shared, the state is not
+            self.initial_state = data.initial_state.clone()
+        else:
+            self.initial_state = data.initial_state
         self.board_size = data.board_size
         self.is_perfect_recall = data.is_perfect_recall
         self.is_best_response = is_best_response
-        if data.player in [0, 1]:
+        if data.player in (0, 1):
             self.player = data.player
 
     def save_policy_to_file(self,
@@ -100,11 +205,15 @@ class Policy:
             policy_name (str): The policy name.
             is_best_response (bool): Whether the policy is best response.
         """
+        # Tabular policies are stored as flat arrays, which pickle much faster
+        # and smaller than millions of small dictionaries.
+        policy_arrays = self._get_policy_arrays()
         data = util.dotdict(
-            policy=self.policy,
+            policy=self.policy if policy_arrays is None else None,
+            policy_arrays=policy_arrays,
             initial_state=self.initial_state,
             board_size=self.board_size,
-            player=self.player if hasattr(self, "player") else None,
+            player=self.player,
             is_perfect_recall=self.is_perfect_recall,
             is_best_response=is_best_response)
         if policy_name.find("/") != -1 and policy_name.find(
@@ -112,15 +221,38 @@ class Policy:
             path = policy_name
         else:
             if is_best_response:
-                path = util.PathVars.policies + policy_name + "/best_response.pkl"
+                path = os.path.join(util.PathVars.policies, policy_name,
+                                    "best_response.pkl")
             else:
-                path = util.PathVars.policies + policy_name + "/policy.pkl"
+                path = os.path.join(util.PathVars.policies, policy_name,
+                                    "policy.pkl")
         util.save_file(data, path)
-        log.info("Saved policy to path: " + path)
+        log.info(f"Saved policy to path: {path}")
+
+    def _get_policy_arrays(self):
+        """
+        Get the policy as flat arrays, see util.policy_to_arrays.
+
+        Returns:
+            The flat arrays, None if the policy is not tabular.
+        """
+        if not isinstance(self.policy, dict):
+            return None
+        return util.policy_to_arrays(self.policy)
+
+    def _set_policy_arrays(self, keys: typing.List[str], offsets: np.ndarray,
+                           actions: np.ndarray, probs: np.ndarray) -> None:
+        """
+        Set the policy from flat arrays, see util.policy_to_arrays.
+        """
+        self.policy = util.arrays_to_policy(keys, offsets, actions, probs)
 
 
 class TabularPolicy(Policy):
 
+    __slots__ = ("_index", "_offsets", "_actions", "_probs", "_best_actions",
+                 "_rows", "_policy_view")
+
     def __init__(
         self,
         policy,
@@ -142,21 +274,163 @@ class TabularPolicy(Policy):
         super().__init__(policy, board_size, initial_state, is_perfect_recall,
                          is_best_response)
 
-    def get_action_probabilities(self,
-                                 info_state: str) -> typing.Dict[int, float]:
+    def __getstate__(self):
+        # The policy is pickled as its flat arrays, the lookup tables and the
+        # read-only views are rebuilt from them.
+        state = {
+            name: getattr(self, name)
+            for cls in type(self).__mro__
+            for name in getattr(cls, "__slots__", ())
+            if name not in TabularPolicy.__slots__ and hasattr(self, name)
+        }
+        return state, self._get_policy_arrays()
+
+    def __setstate__(self, state):
+        state, policy_arrays = state
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._set_policy_arrays(*policy_arrays)
+
+    @property
+    def policy(self) -> typing.Mapping[str, typing.Mapping[int, float]]:
+        """
+        The policy as a read-only mapping of action probability mappings. The
+        policy is stored as flat arrays, the mapping is built on first access
+        and kept until a new policy is set. Assign a new policy to change it.
+        """
+        if self._policy_view is None:
+            self._policy_view = types.MappingProxyType(
+                dict(zip(self._index, self._get_rows())))
+        return self._policy_view
+
+    @policy.setter
+    def policy(self,
+               policy: typing.Mapping[str, typing.Mapping[int, float]]) -> None:
+        self._set_policy_arrays(*util.policy_to_arrays(policy))
+
+    def _get_policy_arrays(self):
+        return list(self._index), self._offsets, self._actions, self._probs
+
+    def _set_policy_arrays(self, keys: typing.List[str], offsets: np.ndarray,
+                           actions: np.ndarray, probs: np.ndarray) -> None:
+        # info state -> row of the info state in offsets. The keys are
+        # interned, so lookups with interned info states (sys.intern) match by
+        # identity without comparing the strings.
+        self._index = {
+            sys.intern(info_state): idx for idx, info_state in enumerate(keys)
+        }
+        self._offsets = offsets
+        self._actions = actions
+        self._probs = probs
+        self._rows = None
+        self._policy_view = None
+        # The policy does not change, so the most likely action of every info
+        # state is found once; -1 if the info state has no actions.
+        self._best_actions = util.best_actions_from_arrays(
+            offsets, actions, probs)
+
+    def _get_rows(self) -> typing.List[typing.Mapping[int, float]]:
+        """
+        The read-only action probabilities of every info state, by id. They
+        are built from the flat arrays on the first lookup and kept until a
+        new policy is set, so lookups do not build a dictionary per call.
+        """
+        if self._rows is None:
+            offsets = self._offsets.tolist()
+            actions = self._actions.tolist()
+            probs = self._probs.tolist()
+            self._rows = [
+                types.MappingProxyType(
+                    dict(zip(actions[start:end], probs[start:end])))
+                for start, end in zip(offsets, offsets[1:])
+            ]
+        return self._rows
+
+    def get_action_probabilities(
+            self, info_state: str) -> typing.Mapping[int, float]:
         """
         Get the action probability dictionary for the given state.
         Args:
             info_state: The info state.
         
         Returns:
-            The action probability dictionary.
+            The read-only action probability dictionary.
         """
-        return self.policy[info_state]
+        rows = self._rows
+        if rows is None:
+            rows = self._get_rows()
+        return rows[self._index[info_state]]
+
+    def get_action(self, info_state: str) -> int:
+        """
+        Take an action for the given state.
+        Args:
+            info_state: The info state.
+        
+        Returns:
+            The action.
+        """
+        return int(self._best_actions[self._index[info_state]])
+
+    def get_info_state_id(self, info_state: str) -> int:
+        """
+        Get the integer id of the given state. Callers that query the same
+        states over and over can keep the ids and use the *_by_id methods,
+        which skip hashing the info state string.
+        Args:
+            info_state: The info state.
+
+        Returns:
+            The id of the info state.
+        """
+        return self._index[info_state]
+
+    def get_action_probabilities_by_id(
+            self, info_state_id: int) -> typing.Mapping[int, float]:
+        """
+        Get the action probability dictionary for the state with the given id.
+        Args:
+            info_state_id: The info state id, see get_info_state_id.
+
+        Returns:
+            The read-only action probability dictionary.
+        """
+        rows = self._rows
+        if rows is None:
+            rows = self._get_rows()
+        return rows[info_state_id]
+
+    def get_action_by_id(self, info_state_id: int) -> int:
+        """
+        Take an action for the state with the given id.
+        Args:
+            info_state_id: The info state id, see get_info_state_id.
+
+        Returns:
+            The action.
+        """
+        return int(self._best_actions[info_state_id])
+
+    def get_actions(self, info_states: typing.Iterable[str]) -> np.ndarray:
+        """
+        Take an action for each of the given states. The actions are gathered
+        from the precomputed best actions at once.
+        Args:
+            info_states: The info states.
+
+        Returns:
+            The actions, in the order of the info states.
+        """
+        index = self._index
+        rows = np.fromiter((index[info_state] for info_state in info_states),
+                           dtype=np.int64)
+        return self._best_actions[rows].astype(np.int64)
 
 
 class SinglePlayerTabularPolicy(TabularPolicy):
 
+    __slots__ = ("opponent",)
+
     def __init__(
         self,
         policy,
@@ -179,28 +453,34 @@ class SinglePlayerTabularPolicy(TabularPolicy):
         """
         super().__init__(policy, board_size, initial_state, is_perfect_recall,
                          is_best_response)
-        if not hasattr(self, 'player'):
+        if self.player is None:
             self.player = player
-        CHECK.PLAYER(self.player)
+        if CHECK.ENABLED:
+            CHECK.PLAYER(self.player)
         self.opponent = 1 - self.player
 
-    def get_action_probabilities(self,
-                                 info_state: str) -> typing.Dict[int, float]:
+    def get_action_probabilities(
+            self, info_state: str) -> typing.Mapping[int, float]:
         """
         Get the action probability dictionary for the given state.
         Args:
             info_state: The info state.
         
         Returns:
-            The action probability dictionary.
+            The read-only action probability dictionary.
         """
         # todo:
         # CHECK.STATE_PLAYER(info_state, self.player)
-        return self.policy[info_state]
+        rows = self._rows
+        if rows is None:
+            rows = self._get_rows()
+        return rows[self._index[info_state]]
 
 
 class PyspielSolverPolicy(Policy):
 
+    __slots__ = ("solver", "policy")
+
     def __init__(self,
                  solver=None,
                  path=None,
@@ -228,6 +508,14 @@ class PyspielSolverPolicy(Policy):
         else:
             self._load_policy(path)
 
+    def refresh_policy(self) -> None:
+        """
+        Get the average policy from the solver again. The average policy is
+        taken from the solver once and kept; for solvers that return a copy
+        rather than a view of it, call this after running more iterations.
+        """
+        self.policy = self.solver.average_policy()
+
     def get_action_probabilities(
             self, pyspiel_state: pyspiel.State) -> typing.Dict[int, float]:
         """
@@ -251,8 +539,7 @@ class PyspielSolverPolicy(Policy):
         Returns:
             (int) The action.
         """
-        action_probs = self.get_action_probabilities(pyspiel_state)
-        return max(action_probs, key=action_probs.get)
+        return _best_action(self.get_action_probabilities(pyspiel_state))
 
     def _load_policy(self, policy_path: str) -> None:
         """
@@ -260,18 +547,23 @@ class PyspielSolverPolicy(Policy):
         Args:
             policy_path (str): The policy path/folder path.
         """
-        if policy_path not in os.listdir(util.PathVars.policies):
+        policy_dir = os.path.join(util.PathVars.policies, policy_path)
+        if not os.path.isdir(policy_dir):
             path = policy_path
         else:
-            path = util.PathVars.policies + policy_path + "/policy.pkl"
+            path = os.path.join(policy_dir, "policy.pkl")
+        # not cached, see _load_policy_data
         data = util.load_file(path)
         self.solver = data.solver
-        self.initial_state = data.initial_state
+        if data.game_string is not None:
+            self.initial_state = _load_game(data.game_string).new_initial_state()
+            for action in data.initial_history:
+                self.initial_state.apply_action(action)
+        else:
+            # saved before the game string was stored instead of the state
+            self.initial_state = data.initial_state
         self.board_size = data.board_size
         self.policy = self.solver.average_policy()
-        self.num_rows = self.board_size[0]
-        self.num_cols = self.board_size[1]
-        self.num_cells = self.num_rows * self.num_cols
 
     def save_policy_to_file(self, policy_name: str) -> None:
         """
@@ -280,19 +572,23 @@ class PyspielSolverPolicy(Policy):
         Args:
             policy_name (str): The policy name.
         """
+        # The initial state is rebuilt from the game on load, which is much
+        # cheaper than pickling the pyspiel state with every policy.
         data = util.dotdict(
             solver=self.solver,
-            initial_state=self.initial_state,
+            game_string=str(self.initial_state.get_game()),
+            initial_history=self.initial_state.history(),
             board_size=self.board_size,
         )
         if policy_name.find("/") != -1 and policy_name.find(
                 ".") != -1:  # policy_name is a path
             path = policy_name
         else:
-            path = util.PathVars.policies + policy_name + "/policy.pkl"
+            path = os.path.join(util.PathVars.policies, policy_name,
+                                "policy.pkl")
         log.debug(path)
         util.save_file(data, path)
-        log.info("Saved policy to path: " + path)
+        log.info(f"Saved policy to path: {path}")
 
 
 def convert_pyspiel_policy_to_darkhex_policy():
@@ -0,0 +1,23 @@
+import pytest
+
+import darkhex.check as CHECK
+
+
+def test_board():
+    CHECK.BOARD("...\n...\n...\n...", 4, 3)
+    CHECK.BOARD("xo.\n.yq\n...\n...", 4, 3)
+    CHECK.BOARD("x..o..", 2, 3)
+    with pytest.raises(ValueError):
+        CHECK.BOARD("...\n...\n...", 4, 3)
+    with pytest.raises(ValueError):
+        CHECK.BOARD("...\n..a\n...\n...", 4, 3)
+    with pytest.raises(ValueError):
+        CHECK.BOARD(None, 4, 3)
+
+
+def test_strategy_generator_checks_initial_board():
+    from darkhex.gui.strategy_generator import StrategyGenerator
+    StrategyGenerator("P1\n...\n...\n...\n...", 4, 3, 1, False)
+    StrategyGenerator("P1\n...\n...\n...\n...\n", 4, 3, 1, False, True)
+    with pytest.raises(ValueError):
+        StrategyGenerator("P1\n...\n...\n...", 4, 3, 1, False)
@@ -0,0 +1,73 @@
+import pytest
+
+from darkhex.gui.history_buffer import gameBuffer
+from darkhex.gui.strategy_generator import StrategyGenerator
+
+INITIAL_STATE = "P1\n...\n...\n...\n..."
+MOVES = ["b2", "= a1 c1", "b1 0.5 c2 0.5", "a2", "= a3 b3"]
+
+
+def _play(max_size):
+    """Plays MOVES with a history buffer of max_size snapshots, returns the
+    strategy generator and the (info_states, current_info_state) seen after
+    every move, starting with the initial ones."""
+    stratgen = StrategyGenerator(INITIAL_STATE, 4, 3, 1, False)
+    stratgen.history_buffer = gameBuffer(INITIAL_STATE, 4, 3, 1, False,
+                                         stratgen, max_size=max_size)
+    seen = [({}, INITIAL_STATE)]
+    for move in MOVES:
+        stratgen.iterate_board(move)
+        seen.append((stratgen.info_states.copy(), stratgen.current_info_state))
+    return stratgen, seen
+
+
+def test_rewind_past_max_size():
+    stratgen, seen = _play(max_size=3)
+    assert len(stratgen.history_buffer.history) == 3
+    for info_states, current_info_state in reversed(seen[-3:-1]):
+        stratgen.history_buffer.rewind()
+        assert stratgen.info_states == info_states
+        assert stratgen.current_info_state == current_info_state
+    # the older snapshots were evicted, the game stays where it is
+    stratgen.history_buffer.rewind()
+    assert stratgen.info_states == seen[-3][0]
+    assert stratgen.current_info_state == seen[-3][1]
+    assert len(stratgen.history_buffer.history) == 1
+
+
+def test_restart_after_eviction():
+    stratgen, seen = _play(max_size=3)
+    assert stratgen.history_buffer.history[0] != \
+        stratgen.history_buffer.initial_snapshot
+    stratgen.history_buffer.restart()
+    assert stratgen.info_states == {}
+    assert stratgen.current_info_state == INITIAL_STATE
+    assert stratgen.target_stack_state is None
+    assert list(stratgen.history_buffer.history) == \
+        [stratgen.history_buffer.initial_snapshot]
+
+
+def test_load_game():
+    played, seen = _play(max_size=64)
+    stratgen = StrategyGenerator("P0\n...\n...\n...", 3, 3, 0, False)
+    stratgen.load_game(played.history_buffer)
+    assert (stratgen.num_rows, stratgen.num_cols) == (4, 3)
+    assert (stratgen.p, stratgen.o) == (1, 0)
+    assert stratgen.info_states == seen[-1][0]
+    assert stratgen.info_states is not played.info_states
+    assert stratgen.current_info_state == seen[-1][1]
+    assert stratgen.history_buffer.stratgen_class is stratgen
+    stratgen.history_buffer.rewind()
+    assert stratgen.info_states == seen[-2][0]
+    assert stratgen.current_info_state == seen[-2][1]
+    assert played.current_info_state == seen[-1][1]
+
+
+def test_repeated_actions_are_rejected():
+    stratgen = StrategyGenerator(INITIAL_STATE, 4, 3, 1, False)
+    for move in ["a1 0.5 a1 0.5", "= a1 a1"]:
+        with pytest.raises(ValueError):
+            stratgen.iterate_board(move)
+    assert stratgen.info_states == {}
+    assert stratgen.action_stack == []
+    assert stratgen.current_info_state == INITIAL_STATE
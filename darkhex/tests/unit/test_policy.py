@@ -1,3 +1,6 @@
+import copy
+import pickle
+import numpy as np
 import pytest
 import pyspiel
 import os
@@ -29,3 +32,195 @@ def test_save_policy_to_file_mccfr_str():
     assert save_path in os.listdir(util.PathVars.policies)
     # delete the created directory
     os.system("rm -rf " + util.PathVars.policies + save_path)
+
+
+def test_tabular_policy_get_actions():
+    test_policy = {
+        "P0\n...\n...\n...": {
+            0: 1.
+        },
+        "P0\nx..\n...\n...": {
+            2: 0.25,
+            1: 0.75
+        },
+        "P0\nxx.\n...\n...": {
+            2: 1.
+        },
+    }  # ! Incomplete policy, just for testing
+    darkhex_policy = policy.SinglePlayerTabularPolicy(
+        test_policy, (4, 3), "P0\n...\n...\n...", 0)
+    info_states = ["P0\nxx.\n...\n...", "P0\n...\n...\n...", "P0\nx..\n...\n..."]
+    assert darkhex_policy.get_actions(info_states).tolist() == [2, 0, 1]
+    assert [darkhex_policy.get_action(s) for s in info_states] == [2, 0, 1]
+    assert darkhex_policy.get_actions(info_states).dtype == np.int64
+    assert darkhex_policy.get_actions([]).dtype == np.int64
+
+
+def test_tabular_policy_by_id():
+    test_policy = {
+        "P0\n...\n...\n...": {
+            0: 1.
+        },
+        "P0\nx..\n...\n...": {
+            2: 0.25,
+            1: 0.75
+        },
+    }  # ! Incomplete policy, just for testing
+    darkhex_policy = policy.TabularPolicy(test_policy, (4, 3),
+                                          "P0\n...\n...\n...")
+    for info_state, action_probs in test_policy.items():
+        info_state_id = darkhex_policy.get_info_state_id(info_state)
+        assert darkhex_policy.get_action_probabilities_by_id(
+            info_state_id) == action_probs
+        assert darkhex_policy.get_action_by_id(
+            info_state_id) == darkhex_policy.get_action(info_state)
+
+
+def _train_solver_policy(save_path):
+    game = pyspiel.load_game("dark_hex_ir(num_cols=3,num_rows=2)")
+    solver = pyspiel.OutcomeSamplingMCCFRSolver(game)
+    for _ in range(10):
+        solver.run_iteration()
+    darkhex_policy = policy.PyspielSolverPolicy(
+        solver=solver,
+        board_size=(2, 3),
+        initial_state=game.new_initial_state())
+    darkhex_policy.save_policy_to_file(save_path)
+    return game, darkhex_policy
+
+
+def test_pyspiel_solver_policy_loads_are_independent(tmp_path):
+    save_path = str(tmp_path / "policy.pkl")
+    game, _ = _train_solver_policy(save_path)
+    state = game.new_initial_state()
+    darkhex_policy = policy.PyspielSolverPolicy(path=save_path)
+    other_policy = policy.PyspielSolverPolicy(path=save_path)
+    saved_probs = other_policy.get_action_probabilities(state)
+
+    for _ in range(2000):
+        darkhex_policy.solver.run_iteration()
+    darkhex_policy.refresh_policy()
+    assert darkhex_policy.get_action_probabilities(state) != saved_probs
+
+    assert other_policy.get_action_probabilities(state) == saved_probs
+    new_policy = policy.PyspielSolverPolicy(path=save_path)
+    assert new_policy.solver is not darkhex_policy.solver
+    assert new_policy.get_action_probabilities(state) == saved_probs
+
+
+def test_tabular_policy_is_read_only():
+    test_policy = {
+        "P0\n...\n...\n...": {
+            0: 1.
+        },
+        "P0\nx..\n...\n...": {
+            2: 0.25,
+            1: 0.75
+        },
+    }  # ! Incomplete policy, just for testing
+    darkhex_policy = policy.TabularPolicy(test_policy, (4, 3),
+                                          "P0\n...\n...\n...")
+    assert darkhex_policy.policy == test_policy
+    assert darkhex_policy.policy is darkhex_policy.policy
+    with pytest.raises(TypeError):
+        darkhex_policy.policy["P0\n...\n...\n..."] = {5: 1.}
+    with pytest.raises(TypeError):
+        darkhex_policy.policy["P0\n...\n...\n..."][5] = 1.
+    assert darkhex_policy.get_action_probabilities(
+        "P0\n...\n...\n...") == {0: 1.}
+    assert darkhex_policy.get_action_probabilities("P0\nx..\n...\n...") is \
+        darkhex_policy.policy["P0\nx..\n...\n..."]
+    with pytest.raises(TypeError):
+        darkhex_policy.get_action_probabilities("P0\n...\n...\n...")[5] = 1.
+
+    darkhex_policy.policy = {"P0\n...\n...\n...": {5: 1.}}
+    assert darkhex_policy.policy == {"P0\n...\n...\n...": {5: 1.}}
+    assert darkhex_policy.get_action("P0\n...\n...\n...") == 5
+
+
+def test_pyspiel_solver_policy_round_trip(tmp_path):
+    game = pyspiel.load_game("dark_hex_ir(num_cols=3,num_rows=2)")
+    solver = pyspiel.OutcomeSamplingMCCFRSolver(game)
+    for _ in range(10):
+        solver.run_iteration()
+    initial_state = game.new_initial_state()
+    initial_state.apply_action(4)
+    darkhex_policy = policy.PyspielSolverPolicy(solver=solver,
+                                                board_size=(2, 3),
+                                                initial_state=initial_state)
+    save_path = str(tmp_path / "policy.pkl")
+    darkhex_policy.save_policy_to_file(save_path)
+
+    loaded_policy = policy.PyspielSolverPolicy(path=save_path)
+    assert loaded_policy.board_size == (2, 3)
+    assert str(loaded_policy.initial_state.get_game()) == str(game)
+    assert loaded_policy.initial_state.history() == [4]
+    assert str(loaded_policy.initial_state) == str(initial_state)
+    for state in (game.new_initial_state(), initial_state):
+        assert loaded_policy.get_action_probabilities(state) == \
+            darkhex_policy.get_action_probabilities(state)
+
+
+def test_pyspiel_solver_policy_loads_legacy_initial_state(tmp_path):
+    game = pyspiel.load_game("dark_hex_ir(num_cols=3,num_rows=2)")
+    solver = pyspiel.OutcomeSamplingMCCFRSolver(game)
+    for _ in range(10):
+        solver.run_iteration()
+    initial_state = game.new_initial_state()
+    save_path = str(tmp_path / "legacy_policy.pkl")
+    util.save_file(
+        util.dotdict({
+            "solver": solver,
+            "initial_state": initial_state,
+            "board_size": (2, 3),
+        }), save_path)
+
+    loaded_policy = policy.PyspielSolverPolicy(path=save_path)
+    assert loaded_policy.board_size == (2, 3)
+    assert str(loaded_policy.initial_state) == str(initial_state)
+    assert loaded_policy.get_action_probabilities(initial_state) == \
+        solver.average_policy().action_probabilities(initial_state)
+
+
+def test_tabular_policy_pickle_and_copy():
+    test_policy = {
+        "P0\n...\n...\n...": {
+            0: 1.
+        },
+        "P0\nx..\n...\n...": {
+            2: 0.25,
+            1: 0.75
+        },
+    }  # ! Incomplete policy, just for testing
+    darkhex_policy = policy.SinglePlayerTabularPolicy(test_policy, (4, 3),
+                                                      "P0\n...\n...\n...", 0)
+    assert darkhex_policy.policy == test_policy  # builds the read-only views
+    for other_policy in (pickle.loads(pickle.dumps(darkhex_policy)),
+                         copy.deepcopy(darkhex_policy)):
+        assert type(other_policy) is policy.SinglePlayerTabularPolicy
+        assert other_policy.policy == test_policy
+        assert other_policy.board_size == (4, 3)
+        assert other_policy.initial_state == "P0\n...\n...\n..."
+        assert (other_policy.player, other_policy.opponent) == (0, 1)
+        assert other_policy.get_action("P0\nx..\n...\n...") == 1
+
+
+def test_tabular_policy_from_policy_view():
+    test_policy = {
+        "P0\n...\n...\n...": {
+            0: 1.
+        },
+        "P0\nx..\n...\n...": {
+            2: 0.25,
+            1: 0.75
+        },
+    }  # ! Incomplete policy, just for testing
+    darkhex_policy = policy.TabularPolicy(test_policy, (4, 3),
+                                          "P0\n...\n...\n...")
+    other_policy = policy.TabularPolicy(darkhex_policy.policy, (4, 3),
+                                        "P0\n...\n...\n...")
+    assert other_policy.policy == test_policy
+    other_policy.policy = {"P0\n...\n...\n...": {5: 1.}}
+    other_policy.policy = darkhex_policy.policy
+    assert other_policy.policy == test_policy
+    assert other_policy.get_action("P0\nx..\n...\n...") == 1
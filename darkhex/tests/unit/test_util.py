@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 import darkhex.utils.util as util
 from darkhex import cellState
 
@@ -110,6 +111,13 @@ def test_convert_xo_to_board():
     assert util.convert_xo_to_board(board) == "..y\n..q\n.Oz\npz."
 
 
+def test_count_pieces():
+    board = "y..\npXq\n.z."
+    assert util.count_pieces(board, cellState.black_pieces) == 3
+    assert util.count_pieces(board, cellState.white_pieces) == 2
+    assert util.count_pieces("...\n...", cellState.black_pieces) == 0
+
+
 def test_is_collusion_possible():
     board = "x..\n.x.\n..."
     player = 0
@@ -230,3 +238,53 @@ def test_policy_tuple_to_policy_dict():
     assert dict_policy["P0\n...\n...\n..."] == {0: 1.}
     assert dict_policy["P0\nx..\n...\n..."] == {1: 0.5, 2: 0.5}
     assert dict_policy["P0\nxx.\n...\n..."] == {2: 1.}
+
+
+def test_policy_to_arrays():
+    test_policy = {
+        "P0\n...\n...\n...": {
+            0: 1.
+        },
+        "P0\nx..\n...\n...": [(1, 0.5), (2, 0.5)],
+        "P0\nxx.\n...\n...": {
+            2: 1.
+        },
+    }  # ! Incomplete policy, just for testing
+    keys, offsets, actions, probs = util.policy_to_arrays(test_policy)
+    assert keys == list(test_policy)
+    assert offsets.tolist() == [0, 1, 3, 4]
+    assert actions.tolist() == [0, 1, 2, 2]
+    assert actions.dtype == np.int8
+    assert probs.tolist() == [1., 0.5, 0.5, 1.]
+    dict_policy = util.arrays_to_policy(keys, offsets, actions, probs)
+    assert dict_policy["P0\n...\n...\n..."] == {0: 1.}
+    assert dict_policy["P0\nx..\n...\n..."] == {1: 0.5, 2: 0.5}
+    assert dict_policy["P0\nxx.\n...\n..."] == {2: 1.}
+
+
+def test_best_actions_from_arrays():
+    test_policy = {
+        "P0\n...\n...\n...": {
+            0: 1.
+        },
+        "P0\nx..\n...\n...": {
+            2: 0.25,
+            1: 0.75
+        },
+        "P0\nxx.\n...\n...": {},
+        "P0\nx.x\n...\n...": {
+            4: 0.5,
+            1: 0.5
+        },
+    }  # ! Incomplete policy, just for testing
+    _, offsets, actions, probs = util.policy_to_arrays(test_policy)
+    best_actions = util.best_actions_from_arrays(offsets, actions, probs)
+    assert best_actions.tolist() == [0, 1, -1, 4]
+
+
+def test_get_random_action():
+    board = "x.o\n...\n.o.\n..x"
+    action = util.get_random_action(board)
+    assert type(action) is int
+    assert util.layered_board_to_flat(board)[action] == cellState.kEmpty
+    assert util.get_random_action("xo\nox") == -1
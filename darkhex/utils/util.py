@@ -1,7 +1,9 @@
 import os
+import collections.abc
 import typing
+import pickle
+import functools
 from copy import deepcopy
-from collections import Counter
 import dill
 import numpy as np
 
@@ -10,6 +12,13 @@ import darkhex.check as CHECK
 from darkhex import logger as log
 
 
+# Size of the memo tables for the pure board helpers below. Boards and info
+# states recur constantly while walking a game, across siblings and rewinds.
+BOARD_CACHE_SIZE = 100_000
+# Buffer size for reading and writing saved files, policies can be large.
+FILE_BUFFER_SIZE = 1 << 20
+
+
 class dotdict(dict):
     """New data structure that allows for dot notation to access dictionary values."""
     __getattr__ = dict.get
@@ -75,8 +84,9 @@ def neighbour_indexes(cell: int, num_cols: int,
     """
     row = cell // num_cols
     col = cell % num_cols
-    CHECK.ROW_INDEX(row, num_rows)
-    CHECK.COLUMN_INDEX(col, num_cols)
+    if CHECK.ENABLED:
+        CHECK.ROW_INDEX(row, num_rows)
+        CHECK.COLUMN_INDEX(col, num_cols)
 
     positions = []
     if col + 1 < num_cols:
@@ -96,6 +106,7 @@ def neighbour_indexes(cell: int, num_cols: int,
     return positions
 
 
+@functools.lru_cache(maxsize=BOARD_CACHE_SIZE)
 def board_after_action(board: str, action: int, player: int) -> str:
     """
     Update the board state with the new action.
@@ -112,11 +123,12 @@ def board_after_action(board: str, action: int, player: int) -> str:
     """
     stone = cellState.kBlack if player == 0 else cellState.kWhite
     num_cols = board.find("\n")
-    board_flat = layered_board_to_flat(board)
-    if board_flat[action] != cellState.kEmpty:
+    # Place the stone on the layered board directly, the cell is shifted by
+    # one newline for every row above it.
+    position = action + action // num_cols if num_cols > 0 else action
+    if board[position] != cellState.kEmpty:
         return False
-    board_flat = board_flat[:action] + stone + board_flat[action + 1:]
-    board_layered = flat_board_to_layered(board_flat, num_cols)
+    board_layered = board[:position] + stone + board[position + 1:]
     log.debug(board_layered)
     return convert_xo_to_board(board_layered)
 
@@ -131,7 +143,16 @@ def load_file(file_path: str) -> typing.Any:
         Any: The content of the file.
     """
     try:
-        return dill.load(open(file_path, "rb"))
+        with open(file_path, "rb", buffering=FILE_BUFFER_SIZE) as f:
+            if hasattr(os, "posix_fadvise"):
+                # the file is read front to back, let the kernel read ahead
+                try:
+                    os.posix_fadvise(f.fileno(), 0, 0,
+                                     os.POSIX_FADV_SEQUENTIAL)
+                except OSError:
+                    # only a hint, some file systems do not support it
+                    pass
+            return dill.load(f)
     except IOError:
         raise IOError(f"File not found: {file_path}")
 
@@ -149,8 +170,17 @@ def save_file(content: typing.Any, file_path: str) -> None:
     directory = os.path.dirname(file_path)
     if not os.path.exists(directory):
         os.makedirs(directory)
-    with open(file_path, "wb") as f:
-        dill.dump(content, f)
+    # The highest protocol frames the output and writes large containers much
+    # faster than the default one, dumping straight into the open file. The C
+    # pickler is used when it can handle the content, dill's pure Python
+    # pickler is only needed for things like lambdas. dill loads both.
+    with open(file_path, "wb", buffering=FILE_BUFFER_SIZE) as f:
+        try:
+            pickle.dump(content, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            f.seek(0)
+            f.truncate()
+            dill.dump(content, f, protocol=dill.HIGHEST_PROTOCOL)
 
 
 def convert_position_to_alphanumeric(position: int, num_cols: int) -> str:
@@ -275,6 +305,21 @@ def convert_xo_to_board(board_in_xo: str) -> str:
     return flat_board_to_layered("".join(board_as_list), num_cols)
 
 
+def count_pieces(board: str, pieces: typing.List[str]) -> int:
+    """
+    Counts the cells of the board that hold any of the given pieces.
+
+    Args:
+        board (str): The board state to count on. [:, :]
+        pieces (typing.List[str]): The cell states to count, i.e.
+        cellState.black_pieces.
+    Returns:
+        int: The number of matching cells.
+    """
+    return sum(board.count(piece) for piece in pieces)
+
+
+@functools.lru_cache(maxsize=BOARD_CACHE_SIZE)
 def is_collusion_possible(board: str, player: int) -> bool:
     """
     Checks if a collusion is possible given the board state and player.
@@ -285,21 +330,16 @@ def is_collusion_possible(board: str, player: int) -> bool:
     Returns:
         bool: True if collusion is possible, False otherwise.
     """
-    CHECK.PLAYER(player)
-    count = Counter(board)
+    if CHECK.ENABLED:
+        CHECK.PLAYER(player)
+    black_pieces = count_pieces(board, cellState.black_pieces)
+    white_pieces = count_pieces(board, cellState.white_pieces)
     if player == 1:
-        player_pieces = sum(
-            [s for x, s in count.items() if x in cellState.white_pieces])
-        opponent_pieces = sum(
-            [s for x, s in count.items() if x in cellState.black_pieces])
-        return opponent_pieces <= player_pieces
-    player_pieces = sum(
-        [s for x, s in count.items() if x in cellState.black_pieces])
-    opponent_pieces = sum(
-        [s for x, s in count.items() if x in cellState.white_pieces])
-    return opponent_pieces < player_pieces
+        return black_pieces <= white_pieces
+    return white_pieces < black_pieces
 
 
+@functools.lru_cache(maxsize=BOARD_CACHE_SIZE)
 def is_board_terminal(board: str, player: int) -> bool:
     """
     Checks if the board is in a terminal state by looking at the number of
@@ -318,21 +358,14 @@ def is_board_terminal(board: str, player: int) -> bool:
         return True
 
     # Checking the number of pieces on the board for end game.
-    ct = Counter(board)
-    empty_cells = ct[cellState.kEmpty]
+    empty_cells = board.count(cellState.kEmpty)
+    black_pieces = count_pieces(board, cellState.black_pieces)
+    white_pieces = count_pieces(board, cellState.white_pieces)
     if player == 0:
-        opponent_pieces = sum(
-            [s for x, s in ct.items() if x in cellState.white_pieces])
-        player_pieces = sum(
-            [s for x, s in ct.items() if x in cellState.black_pieces])
-        if opponent_pieces + empty_cells == player_pieces:
+        if white_pieces + empty_cells == black_pieces:
             return True
     else:
-        opponent_pieces = sum(
-            [s for x, s in ct.items() if x in cellState.black_pieces])
-        player_pieces = sum(
-            [s for x, s in ct.items() if x in cellState.white_pieces])
-        if opponent_pieces + empty_cells == player_pieces + 1:
+        if black_pieces + empty_cells == white_pieces + 1:
             return True
     return False
 
@@ -369,7 +402,8 @@ def get_imperfect_recall_state(player: int, board: str) -> str:
     Returns:
         str: The imperfect recall state.
     """
-    CHECK.PLAYER(player)
+    if CHECK.ENABLED:
+        CHECK.PLAYER(player)
     board_state = convert_board_to_xo(board)
     return "P{}\n{}".format(player, board)
 
@@ -386,7 +420,8 @@ def get_perfect_recall_state(player: int, board: str,
     Returns:
         str: The perfect recall state.
     """
-    CHECK.PLAYER(player)
+    if CHECK.ENABLED:
+        CHECK.PLAYER(player)
     str_action_seq = "".join(
         [f"{player},{action} " for action in action_sequence])
     board = convert_board_to_xo(board)
@@ -473,6 +508,98 @@ def policy_tuple_to_policy_dict(
     return {k: dict(v) for k, v in policy_tuple.items()}
 
 
+def policy_to_arrays(
+    policy: typing.Mapping[str, typing.Mapping[int, float]]
+) -> typing.Tuple[typing.List[str], np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Converts a policy to flat arrays. The actions and probabilities of the
+    info state keys[i] are at actions[offsets[i]:offsets[i + 1]] and
+    probs[offsets[i]:offsets[i + 1]].
+
+    Args:
+        policy (typing.Mapping[str, typing.Mapping[int, float]]): The policy to
+            convert, action probabilities can also be lists of (action,
+            probability) tuples.
+    Returns:
+        typing.List[str]: The info states.
+        np.ndarray: The offsets of the info states in the actions and probs.
+        np.ndarray: The actions, in the smallest signed integer type that fits.
+        np.ndarray: The probabilities.
+    """
+    keys = list(policy)
+    offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+    flat_actions, flat_probs = [], []
+    for idx, action_probs in enumerate(policy.values(), 1):
+        if isinstance(action_probs, collections.abc.Mapping):
+            action_probs = action_probs.items()
+        for action, prob in action_probs:
+            flat_actions.append(action)
+            flat_probs.append(prob)
+        offsets[idx] = len(flat_actions)
+    # Actions are cell indexes, the smallest signed type that holds every one
+    # of them is used (int8 up to 127 cells). The probabilities are kept at
+    # full precision so they are returned exactly as given.
+    # (a negative value makes min_scalar_type pick a signed type)
+    action_dtype = np.min_scalar_type(-max(flat_actions, default=0) - 1)
+    actions = np.array(flat_actions, dtype=action_dtype)
+    probs = np.array(flat_probs, dtype=np.float64)
+    return keys, offsets, actions, probs
+
+
+def best_actions_from_arrays(offsets: np.ndarray, actions: np.ndarray,
+                             probs: np.ndarray) -> np.ndarray:
+    """
+    Finds the most likely action of every info state of a policy given as
+    flat arrays, see policy_to_arrays. Ties go to the action that comes first,
+    like max(action_probs, key=action_probs.get).
+
+    Args:
+        offsets (np.ndarray): The offsets of the info states in the actions and probs.
+        actions (np.ndarray): The actions.
+        probs (np.ndarray): The probabilities.
+    Returns:
+        np.ndarray: The best action for each info state, -1 if the info state
+            has no actions.
+    """
+    lengths = np.diff(offsets)
+    best_actions = np.full(len(lengths), -1, dtype=actions.dtype)
+    rows = np.flatnonzero(lengths)
+    if len(rows) == 0:
+        return best_actions
+    # info state of every action, and the max probability of every info state
+    row_of = np.repeat(np.arange(len(lengths)), lengths)
+    row_max = np.zeros(len(lengths), dtype=probs.dtype)
+    row_max[rows] = np.maximum.reduceat(probs, offsets[rows])
+    # first max of each info state, row_of is sorted so unique keeps the order
+    candidates = np.flatnonzero(probs == row_max[row_of])
+    _, first = np.unique(row_of[candidates], return_index=True)
+    best_actions[rows] = actions[candidates[first]]
+    return best_actions
+
+
+def arrays_to_policy(
+    keys: typing.List[str], offsets: np.ndarray, actions: np.ndarray,
+    probs: np.ndarray) -> typing.Dict[str, typing.Dict[int, float]]:
+    """
+    Converts the flat arrays from policy_to_arrays back to a policy.
+
+    Args:
+        keys (typing.List[str]): The info states.
+        offsets (np.ndarray): The offsets of the info states in the actions and probs.
+        actions (np.ndarray): The actions.
+        probs (np.ndarray): The probabilities.
+    Returns:
+        typing.Dict[str, typing.Dict[int, float]]: The policy.
+    """
+    offsets = offsets.tolist()
+    actions = actions.tolist()
+    probs = probs.tolist()
+    return {
+        key: dict(zip(actions[start:end], probs[start:end]))
+        for key, start, end in zip(keys, offsets, offsets[1:])
+    }
+
+
 def get_all_states(board_size: typing.Tuple[int, int]) -> dict:
     """
     Returns a dictionary of all possible states for Imperfect Recall
@@ -515,11 +642,12 @@ def get_random_action(board: str) -> int:
     if board.find('\n') != -1:
         board = layered_board_to_flat(board)
     legal_actions = [
-        i for i in range(len(board)) if board[i] == cellState.kEmpty
+        i for i, cell in enumerate(board) if cell == cellState.kEmpty
     ]
     if len(legal_actions) == 0:
         return -1
-    return np.random.choice(legal_actions)
+    # np.random.choice gives a numpy integer, actions are plain ints
+    return int(np.random.choice(legal_actions))
 
 
 def info_state_after_action(info_state: str,
@@ -621,6 +749,7 @@ def get_player_from_info_state(info_state: str) -> int:
     return int(info_state[1])
 
 
+@functools.lru_cache(maxsize=BOARD_CACHE_SIZE)
 def is_info_state_terminal(info_state: str, perfect_recall = False) -> bool:
     """
     Checks if the info_state is terminal.